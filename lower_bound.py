@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import io
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import machine_sim
+from machine_sim import (
+    enforce_column_format,
+    read_equipment_file,
+    assign_components_to_equipment,
+)
+
+
+n_machines = 3
+n_heads = 3
+
+def feeder_position(component):
+    """
+    Get the feeder position of a component. The feeders are laid out on the first row of the PCB grid
+    starting with component A at x=2, as in pcb_constructor.py.
+
+    Parameters:
+    component (str): Component name
+
+    Returns:
+    tuple: X and Y coordinates of the feeder
+    """
+    return ord(component) - ord('A') + 2, 0
+
+def round_maxima_sums(values, n_rounds):
+    """
+    Get a lower bound on the sum of the round maxima when the values are split into rounds of at most 3 values.
+
+    With the values sorted in descending order, the i-th largest round maximum is at least the (3i-2)-th value,
+    since the 3i-2 largest values cannot fit in i-1 rounds, and at least the (n-R+i)-th value, since the R maxima
+    are distinct values.
+
+    Parameters:
+    values (ndarray): Values to split into rounds
+    n_rounds (ndarray): Numbers of rounds R, each between ceil(n / 3) and n
+
+    Returns:
+    ndarray: Lower bound on the sum of the round maxima for each number of rounds
+    """
+    n = len(values)
+    values = np.sort(values)[::-1]
+    i = np.arange(1, n + 1)[None, :]
+    n_rounds = np.asarray(n_rounds)[:, None]
+
+    in_rounds = i <= n_rounds
+    capacity_maxima = np.where(3 * i - 2 <= n, values[np.clip(3 * i - 3, 0, n - 1)], 0)
+    distinct_maxima = values[np.clip(n - n_rounds + i - 1, 0, n - 1)]
+    return np.where(in_rounds, np.maximum(capacity_maxima, distinct_maxima), 0).sum(axis=1)
+
+def lower_bound(pcb_file, equipment_file):
+    """
+    Calculate a lower bound on the total distance and on the total score of any strategy for the PCB
+    that picks every component at its feeder_position and places it in the round it is picked.
+
+    Every round starts at the feeder row, so the round travels at least from the feeder of each of its
+    components to its placement. Every round but the last one of each machine also comes back to the
+    feeder row, which adds at least the Y of that placement. The distance bound is the smallest sum of
+    these per-round maxima over rounds of at most 3 placements, less the Y of the 3 highest placements
+    for the last rounds.
+
+    The score bound combines it with the penalties machine_sim charges for the number of parallel rounds P
+    and total rounds R: with P rounds, component c causes at least n_c - s_c * P conflicts when s_c equipment
+    can handle it, and the machines are at least 3P - R rounds out of balance. The bound is the minimum over
+    every feasible (P, R).
+
+    Parameters:
+    pcb_file (str): Path to the PCB data csv file
+    equipment_file (str): Path to the equipment list csv file
+
+    Returns:
+    dict: Distance and score lower bounds and the minimum number of rounds
+    """
+    df_pcb = enforce_column_format(pd.read_csv(pcb_file))
+    places = df_pcb[['X', 'Y']].to_numpy(dtype=float)
+    components = df_pcb['Component'].to_numpy()
+    n_places = len(df_pcb)
+
+    feeders = np.array([feeder_position(component) for component in components], dtype=float)
+    feeder_distance = np.hypot(places[:, 0] - feeders[:, 0], places[:, 1] - feeders[:, 1])
+    round_distance = feeder_distance + places[:, 1]
+    last_rounds_saving = np.sort(places[:, 1])[::-1][:n_machines].sum()
+
+    equipment_components = read_equipment_file(equipment_file)
+    component_to_equipments = assign_components_to_equipment(equipment_components)
+    component_support_count = {component: len(equipments) for component, equipments in component_to_equipments.items()}
+
+    component_count = pd.Series(components).value_counts()
+    # Components no equipment can handle are never reported as conflicts by machine_sim
+    supported = [component for component in component_count.index if component in component_support_count]
+    counts = component_count[supported].to_numpy(dtype=float)
+    support = np.array([component_support_count[component] for component in supported], dtype=float)
+
+    min_total_rounds = math.ceil(n_places / n_heads)
+    min_parallel_rounds = math.ceil(min_total_rounds / n_machines)
+    conflict_free_rounds = max([min_parallel_rounds] + [math.ceil(count / s) for count, s in zip(counts, support)])
+
+    # Every round places at least one component, so there are at most n_places rounds
+    parallel_rounds = np.arange(min_parallel_rounds, n_places + 1)[:, None]
+    total_rounds = np.arange(min_total_rounds, n_places + 1)[None, :]
+    feasible = (total_rounds >= parallel_rounds) & (total_rounds <= n_machines * parallel_rounds)
+
+    distance = np.clip(round_maxima_sums(round_distance, total_rounds[0]) - last_rounds_saving, 0, None)[None, :]
+    conflicts = np.clip(counts[None, :] - support[None, :] * parallel_rounds, 0, None).sum(axis=1)[:, None]
+    imbalance = np.clip(n_machines * parallel_rounds - total_rounds, 0, None)
+    # Same weights as the inter-machine conflict and workload penalties in machine_sim
+    penalty_factor = (conflicts * 2 + imbalance * 2 * 3) / (parallel_rounds * n_machines)
+    score = np.where(feasible, distance * (1 + penalty_factor), np.inf)
+
+    return {
+        'distance': distance.min(),
+        'score': score.min(),
+        'min_total_rounds': min_total_rounds,
+        'conflict_free_rounds': conflict_free_rounds,
+    }
+
+def follows_bound_assumptions(df):
+    """
+    Check if the strategy picks every component at its feeder_position and places it in the round it is picked,
+    which the lower bound relies on. machine_sim checks neither.
+
+    Parameters:
+    df (DataFrame): DataFrame containing the strategy
+
+    Returns:
+    bool: True if the lower bound applies to the strategy, False otherwise
+    """
+    stack = []
+    previous_action = None
+
+    for index, row in df.iterrows():
+        action = row['Action']
+        component = row['Component']
+
+        if action == 'pick':
+            if previous_action == 'place' and stack:
+                return False
+            if (row['X'], row['Y']) != feeder_position(component):
+                return False
+            stack.append(component)
+        elif action == 'place' and component in stack:
+            stack.remove(component)
+        previous_action = action
+
+    return True
+
+def score_strategy(strategy_folder):
+    """
+    Score a strategy with machine_sim without printing its report.
+
+    Parameters:
+    strategy_folder (str): Path to the strategy folder containing the strategy files for Machine A, B and C
+
+    Returns:
+    tuple: Total naive distance, total score and whether the lower bound applies, or None if the strategy is invalid.
+    The lower bound applies to complete strategies that follow the bound assumptions
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        score = machine_sim.main(strategy_folder)
+    if score is None:
+        return None
+
+    code_path = os.path.dirname(os.path.abspath(__file__))
+    dfs = [enforce_column_format(pd.read_csv(f"{strategy_folder}/machine{machine}.csv")) for machine in 'ABC']
+    df_pcb = enforce_column_format(pd.read_csv(f"{code_path}/data.csv"))
+    distance = sum(machine_sim.naive_distance_calculator(df) for df in dfs)
+
+    # The bound only holds for strategies that place every required component
+    complete = machine_sim.pcb_validator(*dfs, df_pcb).empty
+    return distance, score, complete and all(follows_bound_assumptions(df) for df in dfs)
+
+def optimality_gap(value, bound):
+    """
+    Get the relative gap of a value above its lower bound.
+
+    Parameters:
+    value (float): Value reached by a strategy
+    bound (float): Lower bound of the value
+
+    Returns:
+    float: Relative gap, 0 when the value reaches the bound
+    """
+    return (value - bound) / bound if bound > 0 else 0.0
+
+def main(strategy_folders):
+    """
+    Main function to print the lower bounds and the optimality gap of each strategy.
+
+    Parameters:
+    strategy_folders (list): Paths to the strategy folders containing the strategy files for Machine A, B and C
+    """
+    code_path = os.path.dirname(os.path.abspath(__file__))
+
+    start = time.perf_counter()
+    bound = lower_bound(f"{code_path}/data.csv", f"{code_path}/equipment_list.csv")
+    elapsed = time.perf_counter() - start
+
+    print(f"Lower bound computed in {round(elapsed * 1000, 2)} ms")
+    print(f"Minimum number of rounds over all machines: {bound['min_total_rounds']}")
+    print(f"Minimum number of parallel rounds without conflicts: {bound['conflict_free_rounds']}")
+    print(f"Lower bound on total distance: {round(bound['distance'], 2)}")
+    print(f"Lower bound on total score: {round(bound['score'], 2)} \n")
+
+    for strategy_folder in strategy_folders:
+        result = score_strategy(strategy_folder)
+        if result is None:
+            print(f"{strategy_folder}: invalid strategy")
+            continue
+
+        distance, score, bound_applies = result
+        if not bound_applies:
+            print(f"{strategy_folder}: total distance {round(distance, 2)}, total score {round(score, 2)} "
+                  f"(no gap: the strategy is incomplete, picks away from the feeders or carries components across rounds)")
+            continue
+
+        print(f"{strategy_folder}: total distance {round(distance, 2)} "
+              f"(gap {round(optimality_gap(distance, bound['distance']) * 100, 2)}%), "
+              f"total score {round(score, 2)} (gap {round(optimality_gap(score, bound['score']) * 100, 2)}%)")
+
+if __name__ == "__main__":
+    current_file_path = os.path.abspath(__file__)
+    solution_path = os.path.dirname(current_file_path)+"/solution"
+
+    parser = argparse.ArgumentParser(description="Lower bound and optimality gap of strategies.")
+    parser.add_argument('strategy_folders', type=str, nargs='*', help='Paths to the strategy folders', default=[solution_path])
+
+    args = parser.parse_args()
+
+    main(args.strategy_folders)
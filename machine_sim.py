@@ -269,6 +269,91 @@ def count_inter_machine_conflicts(corrected_state, states, component_support_cou
         return {}
     return {'count': count, 'comment': comment}
 
+def parallel_rounds_conflicts(states_A, states_B, states_C, component_support_count, print_report=True):
+    """
+    Run the machines round by round in parallel and count the intra-machine and inter-machine conflicts.
+    The states lists are consumed while the rounds are processed.
+
+    Parameters:
+    states_A (list): List of states of machine A before each "place" action sequance
+    states_B (list): List of states of machine B before each "place" action sequance
+    states_C (list): List of states of machine C before each "place" action sequance
+    component_support_count (dict): Number of equipment that can handle each component
+    print_report (bool): Whether to print the conflicts found in each round
+
+    Returns:
+    tuple: Number of intra-machine conflicts, number of inter-machine conflicts and the list of parallel rounds
+    """
+    intra_machine_conflicts = 0
+    inter_machine_conflicts = 0
+
+    parallel_rounds = []
+    while states_A or states_B or states_C:
+        parallel_round = []
+        if states_A:
+            state_A = states_A.pop(0)
+            # print(f"Processing sublist from state_A: {state_A}")
+
+            machineA_intra_machine_conflict_report = count_intra_machine_conflicts(state_A, component_support_count)
+            if machineA_intra_machine_conflict_report:
+                if print_report:
+                    print(f"Machine A has intra-machine conflicts in round {len(parallel_rounds)+1}")
+                    print(machineA_intra_machine_conflict_report['comment'])
+                    print(f"Machine A has following configuration on Head 1: {state_A[0] if len(state_A) > 0 else '-'}, Head 2: {state_A[1] if len(state_A) > 1 else '-'}, Head 3: {state_A[2] if len(state_A) > 2 else '-'} \n")
+
+                intra_machine_conflicts += machineA_intra_machine_conflict_report['count']
+                parallel_round.extend(machineA_intra_machine_conflict_report['correct_state'])
+            else:
+                parallel_round.extend(state_A)
+
+        if states_B:
+            state_B = states_B.pop(0)
+            # print(f"Processing sublist from state_B: {state_B}")
+
+            machineB_intra_machine_conflict_report = count_intra_machine_conflicts(state_B, component_support_count)
+            if machineB_intra_machine_conflict_report:
+                if print_report:
+                    print(f"Machine B has intra-machine conflicts in round {len(parallel_rounds)+1}")
+                    print(machineB_intra_machine_conflict_report['comment'])
+                    print(f"Machine B has following configuration on Head 1: {state_B[0] if len(state_B) > 0 else '-'}, Head 2: {state_B[1] if len(state_B) > 1 else '-'}, Head 3: {state_B[2] if len(state_B) > 2 else '-'} \n")
+
+                intra_machine_conflicts += machineB_intra_machine_conflict_report['count']
+                parallel_round.extend(machineB_intra_machine_conflict_report['correct_state'])
+            else:
+                parallel_round.extend(state_B)
+        
+        if states_C:
+            state_C = states_C.pop(0)
+            # print(f"Processing sublist from state_C: {state_C}")
+
+            machineC_intra_machine_conflict_report = count_intra_machine_conflicts(state_C, component_support_count)
+            if machineC_intra_machine_conflict_report:
+                if print_report:
+                    print(f"Machine C has intra-machine conflicts in round {len(parallel_rounds)+1}")
+                    print(machineC_intra_machine_conflict_report['comment'])
+                    print(f"Machine C has following configuration on Head 1: {state_C[0] if len(state_C) > 0 else '-'}, Head 2: {state_C[1] if len(state_C) > 1 else '-'}, Head 3: {state_C[2] if len(state_C) > 2 else '-'} \n")
+
+                intra_machine_conflicts += machineC_intra_machine_conflict_report['count']
+                parallel_round.extend(machineC_intra_machine_conflict_report['correct_state'])
+            else:
+                parallel_round.extend(state_C)
+
+        inter_machine_conflict_report = count_inter_machine_conflicts(parallel_round, {'A': state_A, 'B': state_B, 'C': state_C}, component_support_count)
+        if inter_machine_conflict_report:
+            if print_report:
+                print(f"Inter-machine conflicts in round {len(parallel_rounds)+1}")
+                print(inter_machine_conflict_report['comment'])
+                print(f"Machine A has following configuration on Head 1: {state_A[0] if len(state_A) > 0 else '-'}, Head 2: {state_A[1] if len(state_A) > 1 else '-'}, Head 3: {state_A[2] if len(state_A) > 2 else '-'}")
+                print(f"Machine B has following configuration on Head 1: {state_B[0] if len(state_B) > 0 else '-'}, Head 2: {state_B[1] if len(state_B) > 1 else '-'}, Head 3: {state_B[2] if len(state_B) > 2 else '-'}")
+                print(f"Machine C has following configuration on Head 1: {state_C[0] if len(state_C) > 0 else '-'}, Head 2: {state_C[1] if len(state_C) > 1 else '-'}, Head 3: {state_C[2] if len(state_C) > 2 else '-'} \n")
+
+            inter_machine_conflicts += inter_machine_conflict_report['count']
+
+        parallel_rounds.append(parallel_round)
+        # print("\n")
+
+    return intra_machine_conflicts, inter_machine_conflicts, parallel_rounds
+
 def enforce_column_format(df):
     # Ensure the first two columns are numeric
     df.iloc[:, 0] = pd.to_numeric(df.iloc[:, 0], errors='coerce')
@@ -309,6 +394,9 @@ def main(strategy_folder):
 
     Parameters:
     strategy_folder (str): Path to the strategy folder containing the strategy files for Machine A, B and C
+
+    Returns:
+    float: Total score, or None if the strategy is invalid
     """
     # print(f"Simulating machine based on the strategy files in: {strategy_folder}")
 
@@ -326,7 +414,7 @@ def main(strategy_folder):
     if not consecutive_actions_validator(df_A) or not stack_validator(df_A, print_diag) or \
         not consecutive_actions_validator(df_B) or not stack_validator(df_B, print_diag) or \
         not consecutive_actions_validator(df_C) or not stack_validator(df_C, print_diag):
-        return 1
+        return None
     
     df_pcb = enforce_column_format(pd.read_csv(f"{code_path}/data.csv"))
 
@@ -372,69 +460,7 @@ def main(strategy_folder):
         print("No workload penalty.")
     
     print("\nInter and intra machine conflicts:")
-    intra_machine_conflicts = 0
-    inter_machine_conflicts = 0
-
-    parallel_rounds = []
-    while states_A or states_B or states_C:
-        parallel_round = []
-        if states_A:
-            state_A = states_A.pop(0)
-            # print(f"Processing sublist from state_A: {state_A}")
-
-            machineA_intra_machine_conflict_report = count_intra_machine_conflicts(state_A, component_support_count)
-            if machineA_intra_machine_conflict_report:
-                print(f"Machine A has intra-machine conflicts in round {len(parallel_rounds)+1}")
-                print(machineA_intra_machine_conflict_report['comment'])
-                print(f"Machine A has following configuration on Head 1: {state_A[0] if len(state_A) > 0 else '-'}, Head 2: {state_A[1] if len(state_A) > 1 else '-'}, Head 3: {state_A[2] if len(state_A) > 2 else '-'} \n")
-
-                intra_machine_conflicts += machineA_intra_machine_conflict_report['count']
-                parallel_round.extend(machineA_intra_machine_conflict_report['correct_state'])
-            else:
-                parallel_round.extend(state_A)
-
-        if states_B:
-            state_B = states_B.pop(0)
-            # print(f"Processing sublist from state_B: {state_B}")
-
-            machineB_intra_machine_conflict_report = count_intra_machine_conflicts(state_B, component_support_count)
-            if machineB_intra_machine_conflict_report:
-                print(f"Machine B has intra-machine conflicts in round {len(parallel_rounds)+1}")
-                print(machineB_intra_machine_conflict_report['comment'])
-                print(f"Machine B has following configuration on Head 1: {state_B[0] if len(state_B) > 0 else '-'}, Head 2: {state_B[1] if len(state_B) > 1 else '-'}, Head 3: {state_B[2] if len(state_B) > 2 else '-'} \n")
-
-                intra_machine_conflicts += machineB_intra_machine_conflict_report['count']
-                parallel_round.extend(machineB_intra_machine_conflict_report['correct_state'])
-            else:
-                parallel_round.extend(state_B)
-        
-        if states_C:
-            state_C = states_C.pop(0)
-            # print(f"Processing sublist from state_C: {state_C}")
-
-            machineC_intra_machine_conflict_report = count_intra_machine_conflicts(state_C, component_support_count)
-            if machineC_intra_machine_conflict_report:
-                print(f"Machine C has intra-machine conflicts in round {len(parallel_rounds)+1}")
-                print(machineC_intra_machine_conflict_report['comment'])
-                print(f"Machine C has following configuration on Head 1: {state_C[0] if len(state_C) > 0 else '-'}, Head 2: {state_C[1] if len(state_C) > 1 else '-'}, Head 3: {state_C[2] if len(state_C) > 2 else '-'} \n")
-
-                intra_machine_conflicts += machineC_intra_machine_conflict_report['count']
-                parallel_round.extend(machineC_intra_machine_conflict_report['correct_state'])
-            else:
-                parallel_round.extend(state_C)
-
-        inter_machine_conflict_report = count_inter_machine_conflicts(parallel_round, {'A': state_A, 'B': state_B, 'C': state_C}, component_support_count)
-        if inter_machine_conflict_report:
-            print(f"Inter-machine conflicts in round {len(parallel_rounds)+1}")
-            print(inter_machine_conflict_report['comment'])
-            print(f"Machine A has following configuration on Head 1: {state_A[0] if len(state_A) > 0 else '-'}, Head 2: {state_A[1] if len(state_A) > 1 else '-'}, Head 3: {state_A[2] if len(state_A) > 2 else '-'}")
-            print(f"Machine B has following configuration on Head 1: {state_B[0] if len(state_B) > 0 else '-'}, Head 2: {state_B[1] if len(state_B) > 1 else '-'}, Head 3: {state_B[2] if len(state_B) > 2 else '-'}")
-            print(f"Machine C has following configuration on Head 1: {state_C[0] if len(state_C) > 0 else '-'}, Head 2: {state_C[1] if len(state_C) > 1 else '-'}, Head 3: {state_C[2] if len(state_C) > 2 else '-'} \n")
-
-            inter_machine_conflicts += inter_machine_conflict_report['count']
-
-        parallel_rounds.append(parallel_round)
-        # print("\n")
+    intra_machine_conflicts, inter_machine_conflicts, parallel_rounds = parallel_rounds_conflicts(states_A, states_B, states_C, component_support_count)
 
     
     print(f"Total intra-machine conflicts: {intra_machine_conflicts}")
@@ -464,6 +490,7 @@ def main(strategy_folder):
     total_score = total_workload_distance_penalty + total_intra_machine_conflicts_penalty +\
          + total_inter_machine_conflicts_penalty + missing_components_penalty + total_distance
     print(f"Total score: {round(total_score, 2)}")
+    return total_score
     # print("Machine simulation completed.")
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+import argparse
+import csv
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from machine_sim import (
+    enforce_column_format,
+    consecutive_actions_validator,
+    stack_validator,
+    get_before_place_states,
+    read_equipment_file,
+    assign_components_to_equipment,
+    parallel_rounds_conflicts,
+)
+
+
+default_boards = 100
+default_warmup_boards = 1
+report_columns = ['Board', 'Strategy', 'OffsetX', 'OffsetY', 'Distance', 'TransferDistance',
+                  'Rounds', 'IntraConflicts', 'InterConflicts', 'CycleDistance']
+
+def read_boards(boards_file, strategy_folder, n_boards):
+    """
+    Stream the boards of the production run one at a time.
+
+    The boards file is a CSV file with one row per board and the optional columns "Strategy"
+    (strategy folder of the board variant), "OffsetX" and "OffsetY" (board offset). Without a
+    boards file, n_boards boards of the default strategy are produced without offset.
+
+    Parameters:
+    boards_file (str): Path to the boards csv file, or None
+    strategy_folder (str): Strategy folder of boards without a variant
+    n_boards (int): Number of boards when there is no boards file
+
+    Yields:
+    tuple: Strategy folder, X offset and Y offset of the board, or None if the offsets of the board are not numbers
+    """
+    if not boards_file:
+        for _ in range(n_boards):
+            yield strategy_folder, 0.0, 0.0
+        return
+
+    with open(boards_file, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                offset_x = float(row.get('OffsetX') or 0)
+                offset_y = float(row.get('OffsetY') or 0)
+            except ValueError:
+                yield None
+                continue
+            yield row.get('Strategy') or strategy_folder, offset_x, offset_y
+
+def load_strategy(strategy_folder):
+    """
+    Read and validate the strategy files for Machine A, B and C.
+
+    Parameters:
+    strategy_folder (str): Path to the strategy folder containing the strategy files for Machine A, B and C
+
+    Returns:
+    dict: DataFrame of the strategy of each machine, or None if the strategy is invalid or leaves components on the heads
+    """
+    strategy = {}
+    for machine in 'ABC':
+        df = enforce_column_format(pd.read_csv(f"{strategy_folder}/machine{machine}.csv"))
+        if not consecutive_actions_validator(df) or not stack_validator(df):
+            return None
+
+        # Only the head position carries over to the next board, so the heads have to be empty at the end
+        left_on_heads = Counter(df.loc[df['Action'] == 'pick', 'Component']) - Counter(df.loc[df['Action'] == 'place', 'Component'])
+        if left_on_heads:
+            print(f"Error: Machine {machine} of {strategy_folder} ends with components on its heads: {sorted(left_on_heads.elements())}")
+            return None
+        strategy[machine] = df
+    return strategy
+
+def run_board(strategy, offset_x, offset_y, head_positions, component_support_count):
+    """
+    Run the three machines over one board, starting from the head positions left by the previous board.
+    The offset moves the "place" positions only, the feeders stay where they are.
+
+    Parameters:
+    strategy (dict): DataFrame of the strategy of each machine
+    offset_x (float): X offset of the board
+    offset_y (float): Y offset of the board
+    head_positions (dict): Head position of each machine, updated in place
+    component_support_count (dict): Number of equipment that can handle each component
+
+    Returns:
+    dict: Distance, transfer distance, rounds, conflicts and cycle distance of the board
+    """
+    distances = {}
+    transfer_distance = 0
+    states = {}
+    for machine, df in strategy.items():
+        is_place = (df['Action'] == 'place').to_numpy()
+        x = df['X'].to_numpy(dtype=float) + offset_x * is_place
+        y = df['Y'].to_numpy(dtype=float) + offset_y * is_place
+
+        last_x, last_y = head_positions[machine]
+        transfer = ((x[0] - last_x)**2 + (y[0] - last_y)**2)**0.5
+        transfer_distance += transfer
+        distances[machine] = transfer + np.hypot(np.diff(x), np.diff(y)).sum()
+
+        head_positions[machine] = (x[-1], y[-1])
+        states[machine] = get_before_place_states(df)
+
+    intra_machine_conflicts, inter_machine_conflicts, parallel_rounds = parallel_rounds_conflicts(
+        states['A'], states['B'], states['C'], component_support_count, print_report=False)
+
+    return {
+        'Distance': sum(distances.values()),
+        'TransferDistance': transfer_distance,
+        'Rounds': len(parallel_rounds),
+        'IntraConflicts': intra_machine_conflicts,
+        'InterConflicts': inter_machine_conflicts,
+        # The machines run in parallel, so the board is done when the longest machine is done
+        'CycleDistance': max(distances.values()),
+    }
+
+def main(strategy_folder, boards_file, n_boards, warmup_boards, output_file):
+    """
+    Main function to simulate a production run of boards back-to-back with the head positions carried across boards.
+
+    Parameters:
+    strategy_folder (str): Path to the strategy folder used for boards without a variant
+    boards_file (str): Path to the boards csv file, or None
+    n_boards (int): Number of boards when there is no boards file
+    warmup_boards (int): Number of first boards left out of the steady-state figures
+    output_file (str): Path to the per-board report csv file, or None
+    """
+    code_path = os.path.dirname(os.path.abspath(__file__))
+
+    equipment_components = read_equipment_file(f"{code_path}/equipment_list.csv")
+    component_to_equipments = assign_components_to_equipment(equipment_components)
+    component_support_count = {component: len(equipments) for component, equipments in component_to_equipments.items()}
+
+    # Every machine starts the run at (0,0)
+    head_positions = {machine: (0.0, 0.0) for machine in 'ABC'}
+    strategies = {}
+    totals = dict.fromkeys(report_columns[4:], 0)
+    steady_totals = dict.fromkeys(report_columns[4:], 0)
+    n_run = 0
+    n_steady = 0
+
+    output = open(output_file, 'w', newline='') if output_file else None
+    writer = csv.DictWriter(output, fieldnames=report_columns) if output else None
+    if writer:
+        writer.writeheader()
+
+    try:
+        for board in read_boards(boards_file, strategy_folder, n_boards):
+            if board is None:
+                print(f"Error: Board {n_run + 1} has an OffsetX or OffsetY that is not a number.")
+                return None
+
+            board_strategy, offset_x, offset_y = board
+            if board_strategy not in strategies:
+                strategies[board_strategy] = load_strategy(board_strategy)
+            if strategies[board_strategy] is None:
+                print(f"Error: Board {n_run + 1} uses the invalid strategy {board_strategy}.")
+                return None
+
+            report = run_board(strategies[board_strategy], offset_x, offset_y, head_positions, component_support_count)
+            n_run += 1
+
+            print(f"Board {n_run}: distance {round(report['Distance'], 2)} (transfer {round(report['TransferDistance'], 2)}), "
+                  f"rounds {report['Rounds']}, intra-machine conflicts {report['IntraConflicts']}, "
+                  f"inter-machine conflicts {report['InterConflicts']}, cycle distance {round(report['CycleDistance'], 2)}")
+            if writer:
+                writer.writerow({'Board': n_run, 'Strategy': board_strategy, 'OffsetX': offset_x, 'OffsetY': offset_y, **report})
+
+            for key, value in report.items():
+                totals[key] += value
+                if n_run > warmup_boards:
+                    steady_totals[key] += value
+            if n_run > warmup_boards:
+                n_steady += 1
+    finally:
+        if output:
+            output.close()
+
+    if n_run == 0:
+        print("No boards to run.")
+        return None
+
+    print(f"\nTotal boards: {n_run}")
+    print(f"Total distance moved by all machines: {round(totals['Distance'], 2)}")
+    print(f"Total intra-machine conflicts: {totals['IntraConflicts']}")
+    print(f"Total inter-machine conflicts: {totals['InterConflicts']} \n")
+
+    if n_steady == 0:
+        print(f"No steady-state figures: all {n_run} boards are warm-up boards.")
+        return totals
+
+    print(f"Steady-state figures over {n_steady} boards after {n_run - n_steady} warm-up boards:")
+    print(f"Distance per board: {round(steady_totals['Distance'] / n_steady, 2)}")
+    print(f"Transfer distance per board: {round(steady_totals['TransferDistance'] / n_steady, 2)}")
+    print(f"Rounds per board: {round(steady_totals['Rounds'] / n_steady, 2)}")
+    print(f"Conflicts per board: {round((steady_totals['IntraConflicts'] + steady_totals['InterConflicts']) / n_steady, 2)}")
+    print(f"Cycle distance per board: {round(steady_totals['CycleDistance'] / n_steady, 2)}")
+    if steady_totals['CycleDistance'] == 0:
+        print("No throughput: the steady-state boards need no head travel.")
+        return totals
+    print(f"Throughput: {round(1000 * n_steady / steady_totals['CycleDistance'], 4)} boards per 1000 units of head travel")
+    return totals
+
+if __name__ == "__main__":
+    current_file_path = os.path.abspath(__file__)
+    solution_path = os.path.dirname(current_file_path)+"/solution"
+
+    parser = argparse.ArgumentParser(description="Production run simulation.")
+    parser.add_argument('--strategy_folder', type=str, required=False, help='Path to the strategy csv file', default=solution_path)
+    parser.add_argument('--boards_file', type=str, required=False, help='Path to a csv file with one row per board (Strategy, OffsetX, OffsetY)', default=None)
+    parser.add_argument('--boards', type=int, required=False, help='Number of boards when there is no boards file', default=default_boards)
+    parser.add_argument('--warmup', type=int, required=False, help='Number of first boards left out of the steady-state figures', default=default_warmup_boards)
+    parser.add_argument('--output', type=str, required=False, help='Path to the per-board report csv file', default=None)
+
+    args = parser.parse_args()
+
+    main(args.strategy_folder, args.boards_file, args.boards, args.warmup, args.output)
@@ -0,0 +1,284 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from machine_sim import (
+    enforce_column_format,
+    consecutive_actions_validator,
+    stack_validator,
+    get_before_place_states,
+    read_equipment_file,
+    assign_components_to_equipment,
+)
+
+
+default_failure_prob = 0.01
+default_travel_noise = 0.05
+default_trials = 20000
+trials_per_chunk = 2500
+
+def read_failure_file(failure_file):
+    """
+    Read the per-component failure probabilities from a CSV file with "Component" and "Probability" columns.
+
+    Parameters:
+    failure_file (str): Path to the failure probability csv file
+
+    Returns:
+    dict: Failure probability of each component
+    """
+    df = pd.read_csv(failure_file)
+    return {str(row['Component']).upper(): float(row['Probability']) for _, row in df.iterrows()}
+
+def get_place_records(df):
+    """
+    Get the round, component and pick-to-place distance of every "place" action in the strategy.
+    Rounds are counted the same way as in get_before_place_states, so the round index points into its states.
+
+    Parameters:
+    df (DataFrame): DataFrame containing the strategy
+
+    Returns:
+    list: List of (round index, component, pick-to-place distance) tuples
+    """
+    records = []
+    stack = []
+    previous_action = None
+    round_index = -1
+
+    for index, row in df.iterrows():
+        action = row['Action']
+        component = row['Component']
+
+        if action == 'pick':
+            stack.append((component, row['X'], row['Y']))
+            previous_action = 'pick'
+        elif action == 'place':
+            if previous_action == 'pick':
+                round_index += 1
+
+            for i, (picked_component, pick_x, pick_y) in enumerate(stack):
+                if picked_component == component:
+                    stack.pop(i)
+                    distance = ((row['X'] - pick_x)**2 + (row['Y'] - pick_y)**2)**0.5
+                    records.append((round_index, component, distance))
+                    break
+            previous_action = 'place'
+
+    return records
+
+def build_machine_model(df, component_index, failure_probs, failure_prob):
+    """
+    Extract the arrays the Monte Carlo trials need from a machine strategy.
+
+    Parameters:
+    df (DataFrame): DataFrame containing the strategy
+    component_index (dict): Column index of each component
+    failure_probs (dict): Failure probability of each component
+    failure_prob (float): Failure probability of components missing from failure_probs
+
+    Returns:
+    dict: Leg distances, per-round component counts and per-place retry data of the machine
+    """
+    legs = np.hypot(np.diff(df['X'].to_numpy(dtype=float)), np.diff(df['Y'].to_numpy(dtype=float)))
+
+    states = get_before_place_states(df)
+    round_counts = np.zeros((len(states), len(component_index)), dtype=np.int32)
+    for round_index, state in enumerate(states):
+        for component in state:
+            round_counts[round_index, component_index[component]] += 1
+
+    records = get_place_records(df)
+    return {
+        'legs': legs,
+        'round_counts': round_counts,
+        'place_round': np.array([record[0] for record in records], dtype=np.int64),
+        'place_component': np.array([component_index[record[1]] for record in records], dtype=np.int64),
+        # *2 for going back to the feeder and returning to the placement
+        'retry_distance': np.array([2 * record[2] for record in records], dtype=float),
+        'fail_prob': np.array([failure_probs.get(record[1], failure_prob) for record in records], dtype=float),
+    }
+
+def run_trials(models, support, n_trials, seed, travel_noise):
+    """
+    Run a batch of Monte Carlo trials of the parallel machines.
+
+    Every leg is scaled by a noise factor 1 + travel_noise * N(0, 1). Every failed pick
+    makes the machine go back and forth to the feeder once more and adds one recovery round
+    holding only the components that failed again, which shifts the later rounds of that machine.
+
+    Parameters:
+    models (list): Machine models built by build_machine_model
+    support (ndarray): Number of equipment that can handle each component
+    n_trials (int): Number of trials to run
+    seed (SeedSequence): Seed of the random generator
+    travel_noise (float): Relative standard deviation of the travel distance of each leg
+
+    Returns:
+    dict: Total distance, number of parallel rounds and intra/inter-machine conflicts of each trial
+    """
+    rng = np.random.default_rng(seed)
+    trial_index = np.arange(n_trials)[:, None]
+    total_distance = np.zeros(n_trials)
+
+    timelines = []
+    for model in models:
+        legs = model['legs']
+        noise = np.clip(1 + travel_noise * rng.standard_normal((n_trials, legs.size)), 0, None)
+        total_distance += noise @ legs
+
+        # Number of failed attempts before each component is placed
+        retries = rng.geometric(1 - model['fail_prob'], size=(n_trials, model['fail_prob'].size)) - 1
+        # The sum of r noisy retry trips has mean r and standard deviation travel_noise * sqrt(r)
+        retry_noise = retries + travel_noise * np.sqrt(retries) * rng.standard_normal(retries.shape)
+        total_distance += np.clip(retry_noise, 0, None) @ model['retry_distance']
+
+        n_rounds = model['round_counts'].shape[0]
+        extra_rounds = np.zeros((n_trials, n_rounds), dtype=np.int64)
+        for round_index in range(n_rounds):
+            in_round = model['place_round'] == round_index
+            if in_round.any():
+                extra_rounds[:, round_index] = retries[:, in_round].max(axis=1)
+        round_start = np.arange(n_rounds) + np.cumsum(extra_rounds, axis=1) - extra_rounds
+        timelines.append((retries, round_start, n_rounds + extra_rounds.sum(axis=1)))
+
+    rounds = np.max([n_slots for _, _, n_slots in timelines], axis=0)
+    max_rounds = int(rounds.max())
+
+    raw_counts = np.zeros((n_trials, max_rounds, support.size), dtype=np.int32)
+    corrected_counts = np.zeros_like(raw_counts)
+    intra_conflicts = np.zeros(n_trials, dtype=np.int64)
+    for model, (retries, round_start, _) in zip(models, timelines):
+        counts = np.zeros_like(raw_counts)
+        counts[trial_index, round_start, :] = model['round_counts'][None, :, :]
+        for attempt in range(1, int(retries.max(initial=0)) + 1):
+            failed_trial, failed_place = np.nonzero(retries >= attempt)
+            recovery_round = round_start[failed_trial, model['place_round'][failed_place]] + attempt
+            np.add.at(counts, (failed_trial, recovery_round, model['place_component'][failed_place]), 1)
+
+        intra_conflicts += np.clip(counts - support, 0, None).sum(axis=(1, 2))
+        raw_counts += counts
+        corrected_counts += np.minimum(counts, support)
+
+    inter_conflicts = np.where(corrected_counts > support, raw_counts - support, 0).sum(axis=(1, 2))
+
+    return {
+        'distance': total_distance,
+        'rounds': rounds,
+        'intra_conflicts': intra_conflicts,
+        'inter_conflicts': inter_conflicts,
+    }
+
+def _run_trials_chunk(args):
+    return run_trials(*args)
+
+def monte_carlo(models, support, n_trials, travel_noise, workers=None, seed=None):
+    """
+    Run the Monte Carlo trials in chunks spread across processes.
+
+    Parameters:
+    models (list): Machine models built by build_machine_model
+    support (ndarray): Number of equipment that can handle each component
+    n_trials (int): Total number of trials
+    travel_noise (float): Relative standard deviation of the travel distance of each leg
+    workers (int): Number of worker processes, all CPUs if None
+    seed (int): Seed of the random generator, random if None
+
+    Returns:
+    dict: Total distance, number of parallel rounds and intra/inter-machine conflicts of each trial
+    """
+    chunk_sizes = [trials_per_chunk] * (n_trials // trials_per_chunk)
+    if n_trials % trials_per_chunk:
+        chunk_sizes.append(n_trials % trials_per_chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    chunks = [(models, support, size, chunk_seed, travel_noise) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        results = [_run_trials_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(_run_trials_chunk, chunks))
+
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+def print_distribution(name, values):
+    percentiles = np.percentile(values, [5, 50, 95])
+    print(f"{name}: mean {round(float(np.mean(values)), 2)}, std {round(float(np.std(values)), 2)}, "
+          f"p5 {round(percentiles[0], 2)}, p50 {round(percentiles[1], 2)}, p95 {round(percentiles[2], 2)}")
+
+def main(strategy_folder, n_trials, failure_prob, failure_file, travel_noise, workers, seed):
+    """
+    Main function to simulate the robustness of the given strategy against pick failures and travel noise.
+
+    Parameters:
+    strategy_folder (str): Path to the strategy folder containing the strategy files for Machine A, B and C
+    n_trials (int): Number of Monte Carlo trials
+    failure_prob (float): Failure probability of components missing from the failure file
+    failure_file (str): Path to the per-component failure probability csv file, or None
+    travel_noise (float): Relative standard deviation of the travel distance of each leg
+    workers (int): Number of worker processes, all CPUs if None
+    seed (int): Seed of the random generator, random if None
+    """
+    code_path = os.path.dirname(os.path.abspath(__file__))
+
+    dfs = [enforce_column_format(pd.read_csv(f"{strategy_folder}/machine{machine}.csv")) for machine in 'ABC']
+    for df in dfs:
+        if not consecutive_actions_validator(df) or not stack_validator(df):
+            return 1
+
+    if n_trials <= 0:
+        print("Error: The number of trials must be positive.")
+        return 1
+
+    if travel_noise < 0:
+        print("Error: Travel noise must be non-negative.")
+        return 1
+
+    failure_probs = read_failure_file(failure_file) if failure_file else {}
+    if not all(0 <= prob < 1 for prob in list(failure_probs.values()) + [failure_prob]):
+        print("Error: Failure probabilities must be in [0, 1).")
+        return 1
+
+    equipment_components = read_equipment_file(f"{code_path}/equipment_list.csv")
+    component_to_equipments = assign_components_to_equipment(equipment_components)
+    component_support_count = {component: len(equipments) for component, equipments in component_to_equipments.items()}
+
+    components = sorted(set(pd.concat([df['Component'] for df in dfs]).dropna()))
+    component_index = {component: i for i, component in enumerate(components)}
+    # Components no equipment can handle are never reported as conflicts by machine_sim
+    unlimited = np.iinfo(np.int32).max
+    support = np.array([component_support_count.get(component, unlimited) for component in components], dtype=np.int32)
+
+    models = [build_machine_model(df, component_index, failure_probs, failure_prob) for df in dfs]
+    results = monte_carlo(models, support, n_trials, travel_noise, workers, seed)
+
+    nominal_distance = sum(model['legs'].sum() for model in models)
+    print(f"Monte Carlo robustness simulation over {n_trials} trials")
+    print(f"Nominal distance moved by all machines: {round(nominal_distance, 2)} \n")
+    print_distribution("Total distance moved by all machines", results['distance'])
+    print_distribution("Number of parallel rounds", results['rounds'])
+    print_distribution("Intra-machine conflicts", results['intra_conflicts'])
+    print_distribution("Inter-machine conflicts", results['inter_conflicts'])
+    print(f"\nExpected conflicts per run: {round(float(np.mean(results['intra_conflicts'] + results['inter_conflicts'])), 2)}")
+    print(f"Probability of at least one conflict: {round(float(np.mean(results['intra_conflicts'] + results['inter_conflicts'] > 0)), 4)}")
+
+if __name__ == "__main__":
+    current_file_path = os.path.abspath(__file__)
+    solution_path = os.path.dirname(current_file_path)+"/solution"
+
+    parser = argparse.ArgumentParser(description="Monte Carlo robustness simulation.")
+    parser.add_argument('--strategy_folder', type=str, required=False, help='Path to the strategy csv file', default=solution_path)
+    parser.add_argument('--trials', type=int, required=False, help='Number of Monte Carlo trials', default=default_trials)
+    parser.add_argument('--failure_prob', type=float, required=False, help='Pick failure probability of each component', default=default_failure_prob)
+    parser.add_argument('--failure_file', type=str, required=False, help='Path to a csv file with per-component failure probabilities (Component, Probability)', default=None)
+    parser.add_argument('--travel_noise', type=float, required=False, help='Relative standard deviation of the travel distance of each leg', default=default_travel_noise)
+    parser.add_argument('--workers', type=int, required=False, help='Number of worker processes', default=None)
+    parser.add_argument('--seed', type=int, required=False, help='Seed of the random generator', default=None)
+
+    args = parser.parse_args()
+
+    main(args.strategy_folder, args.trials, args.failure_prob, args.failure_file, args.travel_noise, args.workers, args.seed)